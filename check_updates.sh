@@ -0,0 +1,52 @@
+#!/bin/bash
+
+# Lightweight Telegram prefetch - runs BEFORE pip install so runs with an
+# empty inbox never pay the Python/dependency cold start.
+# Writes the raw getUpdates response to /tmp/gitbutler/telegram_updates.json
+# for bot.py to consume (fetch_new_messages use_cached path).
+
+set -e
+
+CACHE_DIR="/tmp/gitbutler"
+CACHE_FILE="$CACHE_DIR/telegram_updates.json"
+STATE_FILE="storage/state.json"
+
+echo "🔍 Checking for new Telegram messages..."
+
+# Read the last processed update_id from state.json (tolerates spaced JSON)
+if [ -f "$STATE_FILE" ]; then
+  LAST_UPDATE_ID=$(grep -o '"last_update_id"[[:space:]]*:[[:space:]]*[0-9]*' "$STATE_FILE" | grep -o '[0-9]*$' || true)
+fi
+LAST_UPDATE_ID=${LAST_UPDATE_ID:-0}
+
+echo "📊 Last processed update_id: $LAST_UPDATE_ID"
+
+OFFSET=$((LAST_UPDATE_ID + 1))
+API_URL="https://api.telegram.org/bot${TELEGRAM_TOKEN:-$TELEGRAM_BOT_TOKEN}/getUpdates"
+
+RESPONSE=$(curl -s "${API_URL}?offset=${OFFSET}&limit=100&timeout=0&allowed_updates=%5B%22message%22%5D")
+
+if [ -z "$RESPONSE" ]; then
+  echo "❌ Empty response from Telegram API"
+  exit 1
+fi
+
+if ! echo "$RESPONSE" | grep -q '"ok":true'; then
+  echo "❌ Telegram API error: $RESPONSE"
+  exit 1
+fi
+
+UPDATE_COUNT=$(echo "$RESPONSE" | grep -o '"update_id"' | wc -l)
+
+echo "📨 Found $UPDATE_COUNT new update(s)"
+
+mkdir -p "$CACHE_DIR"
+printf '%s' "$RESPONSE" > "$CACHE_FILE"
+
+if [ "$UPDATE_COUNT" -gt 0 ]; then
+  echo "✅ New messages detected - proceeding with processing"
+  echo "has_messages=true" >> "${GITHUB_OUTPUT:-/dev/null}"
+else
+  echo "✅ No new messages - skipping processing"
+  echo "has_messages=false" >> "${GITHUB_OUTPUT:-/dev/null}"
+fi
@@ -0,0 +1,40 @@
+"""
+Shared pytest fixtures
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bot
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _bootstrap():
+    """Create the storage tree once for the whole test session
+
+    Individual tests used to call ensure_directories/ensure_files
+    themselves; the process-level guard in bot makes repeat calls free,
+    and this fixture guarantees the first one has happened.
+    """
+    bot.ensure_directories()
+    bot.ensure_files()
+
+
+@pytest.fixture
+def iso(tmp_path, monkeypatch):
+    """Route state and update-cache paths into tmp_path
+
+    Keeps fetch tests from mutating the real storage/ tree and
+    /tmp/gitbutler, which also makes them safe to run in parallel.
+    """
+    state_path = tmp_path / "storage" / "state.json"
+    state_path.parent.mkdir()
+    monkeypatch.setattr(bot, "STATE_PATH", state_path)
+    monkeypatch.setattr(bot, "TELEGRAM_UPDATES_CACHE",
+                        tmp_path / "cache" / "telegram_updates.json")
+    monkeypatch.setattr(bot, "_CACHE_CONSUMED_STAMP", None)
+    return tmp_path
@@ -2,110 +2,91 @@
 Basic tests for GitButler bot
 """
 import os
-import json
 import tempfile
 from pathlib import Path
 import sys
 
+import orjson
+import pytest
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import bot
+from bot import (SKILLS_DIR, SOUL_PATH, STATE_PATH, STORAGE_DIR,
+                 load_skills, read_json, write_json)
 
 def test_directory_creation():
     """Test that bot creates necessary directories"""
     bot.ensure_directories()
-    assert Path("storage").exists()
-    assert Path("skills").exists()
+    assert STORAGE_DIR.exists()
+    assert SKILLS_DIR.exists()
     print("✓ Directory creation test passed")
 
 def test_file_creation():
     """Test that bot creates necessary files"""
     bot.ensure_files()
-    assert Path("storage/soul.md").exists()
-    assert Path("storage/state.json").exists()
+    assert SOUL_PATH.exists()
+    assert STATE_PATH.exists()
     print("✓ File creation test passed")
 
 def test_json_operations():
     """Test JSON read/write operations"""
-    from bot import read_json, write_json
-    
     # Test read
-    state = read_json(Path("storage/state.json"))
+    state = read_json(STATE_PATH)
     assert isinstance(state, dict)
     assert "last_update_id" in state
     
     # Test write
-    test_path = Path("storage/test.json")
+    test_path = STORAGE_DIR / "test.json"
     test_data = {"test": "data", "number": 123}
     write_json(test_path, test_data)
-    
+
     # Read back
     result = read_json(test_path)
     assert result["test"] == "data"
     assert result["number"] == 123
-    
+
+    # The on-disk bytes should round-trip through orjson directly
+    assert orjson.loads(test_path.read_bytes()) == test_data
+
+    # read_json should also accept bytes seeded straight from orjson
+    test_path.write_bytes(orjson.dumps({"seeded": True}))
+    assert read_json(test_path) == {"seeded": True}
+
     # Cleanup
     test_path.unlink()
     print("✓ JSON operations test passed")
 
+@pytest.mark.skipif(not any(SKILLS_DIR.rglob("skill.md")),
+                    reason="no skills installed")
 def test_load_skills():
     """Test skill loading"""
-    from bot import load_skills
-    
     skills = load_skills()
     assert isinstance(skills, str), "Skills should be returned as a string"
-    # Check if skills were loaded (either has content or explicit "no skills" message)
-    has_content = len(skills) > 0
-    assert has_content, "Skills loading should return content or a message"
+    # Structural check: each loaded skill gets its own header section
+    assert "### Skill:" in skills, "Loaded skills should include skill headers"
     print("✓ Skill loading test passed")
 
 def test_context_files_exist():
     """Test that all OpenClaw-style context files exist"""
     bot.ensure_files()
-    
-    # Check all context files
-    assert Path("storage/soul.md").exists(), "soul.md should exist"
-    
+
+    # One scandir pass gives every entry, instead of a stat per file
+    names = {entry.name for entry in os.scandir("storage")}
+    assert {"soul.md", "state.json"} <= names, "bootstrap files should exist"
+
     print("✓ Context files existence test passed")
 
 def test_context_files_readable():
     """Test that context files can be read"""
-    from bot import SOUL_PATH
-    
-    # Read soul file - should exist after test_file_creation
-    soul_content = SOUL_PATH.read_text()
-    
+    # Raw bytes are enough for the substring checks - skips the UTF-8 decode
+    soul_content = SOUL_PATH.read_bytes()
+
     # Verify they have content
     assert len(soul_content) > 0, "soul.md should have content"
-    
+
     # Verify key sections exist
-    assert "GitButler" in soul_content, "soul.md should mention GitButler"
+    assert b"GitButler" in soul_content, "soul.md should mention GitButler"
     
     print("✓ Context files readability test passed")
-
-def run_tests():
-    """Run all tests"""
-    print("Running GitButler tests...\n")
-    
-    try:
-        test_directory_creation()
-        test_file_creation()
-        test_json_operations()
-        test_load_skills()
-        test_context_files_exist()
-        test_context_files_readable()
-        
-        print("\n✅ All tests passed!")
-        return 0
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        return 1
-    except Exception as e:
-        print(f"\n❌ Error running tests: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
-if __name__ == "__main__":
-    exit(run_tests())
@@ -2,11 +2,11 @@
 Test for cached Telegram updates functionality
 """
 import os
-import json
-import tempfile
 from pathlib import Path
 import sys
 
+import orjson
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -16,12 +16,12 @@ import bot
 DEFAULT_TEST_CHAT_ID = 123456789
 
 
-def test_fetch_with_cache():
+def test_fetch_with_cache(iso):
     """Test that fetch_new_messages can use cached data"""
     
     # Create a mock cached response using the constant from bot.py
     cache_file = bot.TELEGRAM_UPDATES_CACHE
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    bot._ensure_parent(cache_file)
     
     # Use a valid chat_id from environment or default
     chat_id_str = os.environ.get("TELEGRAM_CHAT_ID", str(DEFAULT_TEST_CHAT_ID))
@@ -46,12 +46,8 @@ def test_fetch_with_cache():
         ]
     }
     
-    # Write cache file
-    cache_file.write_text(json.dumps(mock_response))
-    
-    # Ensure state file exists
-    bot.ensure_directories()
-    bot.ensure_files()
+    # Write cache file (bytes straight from orjson, no str round-trip)
+    cache_file.write_bytes(orjson.dumps(mock_response))
     
     # Test fetch with cache (requires TELEGRAM_TOKEN and TELEGRAM_CHAT_ID to be set)
     if os.environ.get("TELEGRAM_TOKEN") and os.environ.get("TELEGRAM_CHAT_ID"):
@@ -65,12 +61,9 @@ def test_fetch_with_cache():
     else:
         print("⊘ Skipping cached fetch test (requires TELEGRAM_TOKEN and TELEGRAM_CHAT_ID)")
     
-    # Cleanup
-    cache_file.unlink()
-    
     print("✓ Cached updates test passed")
 
-def test_fetch_without_cache_fallback():
+def test_fetch_without_cache_fallback(iso):
     """Test that fetch_new_messages falls back to API when cache doesn't exist"""
     
     # Ensure cache doesn't exist
@@ -78,10 +71,6 @@ def test_fetch_without_cache_fallback():
     if cache_file.exists():
         cache_file.unlink()
     
-    # Ensure state file exists
-    bot.ensure_directories()
-    bot.ensure_files()
-    
     # Test should not crash when cache doesn't exist
     # (Will make actual API call if credentials are set, or return None)
     try:
@@ -90,25 +79,3 @@ def test_fetch_without_cache_fallback():
     except Exception as e:
         print(f"✗ Fallback test failed with error: {e}")
         raise
-
-def run_tests():
-    """Run all tests"""
-    print("Running cached updates tests...\n")
-    
-    try:
-        test_fetch_with_cache()
-        test_fetch_without_cache_fallback()
-        
-        print("\n✅ All cached updates tests passed!")
-        return 0
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        return 1
-    except Exception as e:
-        print(f"\n❌ Error running tests: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
-if __name__ == "__main__":
-    exit(run_tests())
@@ -5,9 +5,26 @@ Tests for check_updates.sh to ensure it reads state correctly.
 import os
 import json
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bot
+
+
+def test_compute_offset_matches_state(tmp_path):
+    """compute_offset is the Python mirror of the shell grep logic"""
+    state_path = tmp_path / "state.json"
+    state_path.write_text(json.dumps({"last_update_id": 41}, indent=2))
+    assert bot.compute_offset(state_path) == 42
+
+    # Missing file and corrupt update_id both fall back to offset 1
+    assert bot.compute_offset(tmp_path / "missing.json") == 1
+    state_path.write_text(json.dumps({"last_update_id": "oops"}))
+    assert bot.compute_offset(state_path) == 1
+
 
 def test_check_updates_uses_stored_update_id():
     """Ensure check_updates.sh reads last_update_id even with spaced JSON."""
@@ -56,26 +73,6 @@ def test_check_updates_uses_stored_update_id():
         args_used = fake_args_path.read_text()
         assert "offset=42" in args_used, f"Expected offset to use stored update_id, got: {args_used}"
 
-        cache_file = Path("/tmp/gitbutler/telegram_updates.json")
+        cache_file = bot.TELEGRAM_UPDATES_CACHE
         if cache_file.exists():
             cache_file.unlink()
-
-
-def run_tests():
-    print("Running check_updates parsing tests...\n")
-    try:
-        test_check_updates_uses_stored_update_id()
-        print("\n✅ check_updates parsing tests passed!")
-        return 0
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        return 1
-    except Exception as e:
-        print(f"\n❌ Error running tests: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
-
-if __name__ == "__main__":
-    exit(run_tests())
@@ -14,6 +14,7 @@ from datetime import datetime, timezone
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import bot
+from bot import format_status_message
 
 def test_continuous_mode_initialization():
     """Test that continuous mode initializes state properly"""
@@ -87,24 +88,28 @@ def test_control_commands_parsing():
     
     print("✓ Control commands parsing test passed")
 
-def test_run_mode_environment_variable():
+def test_run_mode_environment_variable(monkeypatch):
     """Test RUN_MODE environment variable handling"""
     # Test continuous mode
-    os.environ["RUN_MODE"] = "continuous"
-    run_mode = os.environ.get("RUN_MODE", "continuous").lower()
-    assert run_mode == "continuous"
-    
-    # Test single mode
-    os.environ["RUN_MODE"] = "single"
-    run_mode = os.environ.get("RUN_MODE", "continuous").lower()
-    assert run_mode == "single"
-    
+    monkeypatch.setenv("RUN_MODE", "continuous")
+    bot._run_mode.cache_clear()
+    assert bot._run_mode() == "continuous"
+
+    # Test single mode (mixed case exercises the lowering)
+    monkeypatch.setenv("RUN_MODE", "Single")
+    bot._run_mode.cache_clear()
+    assert bot._run_mode() == "single"
+
     # Test default
-    if "RUN_MODE" in os.environ:
-        del os.environ["RUN_MODE"]
-    run_mode = os.environ.get("RUN_MODE", "continuous").lower()
-    assert run_mode == "continuous"
-    
+    monkeypatch.delenv("RUN_MODE", raising=False)
+    bot._run_mode.cache_clear()
+    assert bot._run_mode() == "continuous"
+
+    # The cached value survives env churn until cleared
+    monkeypatch.setenv("RUN_MODE", "single")
+    assert bot._run_mode() == "continuous"
+    bot._run_mode.cache_clear()
+
     print("✓ RUN_MODE environment variable test passed")
 
 def test_idle_counter_logic():
@@ -170,8 +175,6 @@ def test_mode_specific_sleep_intervals():
 
 def test_status_message_formatting():
     """Test status message formatting"""
-    from bot import format_status_message
-    
     mode = "active"
     uptime_str = "0:05:23"
     message_count = 5
@@ -186,37 +189,3 @@ def test_status_message_formatting():
     assert f"Idle cycles: {idle_counter}/{max_idle_cycles}" in status_msg
     
     print("✓ Status message formatting test passed")
-
-def run_tests():
-    """Run all continuous mode tests"""
-    print("Running continuous mode tests...\n")
-    
-    try:
-        # Ensure bot is initialized
-        bot.ensure_directories()
-        bot.ensure_files()
-        
-        test_continuous_mode_initialization()
-        test_state_transitions()
-        test_control_commands_parsing()
-        test_run_mode_environment_variable()
-        test_idle_counter_logic()
-        test_session_tracking()
-        test_mode_specific_sleep_intervals()
-        test_status_message_formatting()
-        
-        print("\n✅ All continuous mode tests passed!")
-        return 0
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-    except Exception as e:
-        print(f"\n❌ Error running tests: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
-if __name__ == "__main__":
-    exit(run_tests())
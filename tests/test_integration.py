@@ -22,14 +22,14 @@ def test_session_cache_lifecycle():
 
     # Reset cache
     bot.SESSION_CACHE["messages"].clear()
-    bot.SESSION_CACHE["start_notified"] = False
-    bot.SESSION_CACHE["stop_notified"] = False
+    bot.SESSION_CACHE["flags"] = 0
     bot.SESSION_CACHE["start_time"] = None
 
     with patch("bot.send_telegram_message") as mock_send:
         mock_send.return_value = True
 
         bot.start_session()
+        assert bot.SESSION_CACHE["flags"] & bot._START_NOTIFIED
         # Add two messages to the in-memory cache
         bot.record_session_message({"message_id": 1, "text": "Hello"})
         bot.record_session_message({"message_id": 2, "text": "World"})
@@ -39,29 +39,11 @@ def test_session_cache_lifecycle():
         bot.end_session("completed")
         bot.end_session("completed")  # second call should not send again
 
+        # After the session ends, recording is a no-op fast path
+        bot.record_session_message({"message_id": 3, "text": "late"})
+
         # Start + stop notifications only once each
         assert mock_send.call_count == 2, "Notifications should be sent exactly once at start and stop"
-        assert bot.SESSION_CACHE["messages"] == [], "Cache should be cleared after the session ends"
+        assert len(bot.SESSION_CACHE["messages"]) == 0, "Cache should be cleared after the session ends"
         assert bot.SESSION_CACHE["start_time"] is None, "Session timing should reset after stopping"
-
-
-def run_tests():
-    """Run integration tests"""
-    print("Running integration tests...\n")
-    
-    try:
-        test_session_cache_lifecycle()
-        
-        print("\n✅ All integration tests passed!")
-        return 0
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        return 1
-    except Exception as e:
-        print(f"\n❌ Error running tests: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
-if __name__ == "__main__":
-    exit(run_tests())
+        assert bot.SESSION_CACHE["flags"] & bot._STOP_NOTIFIED, "Stop should latch until the next start"
@@ -48,9 +48,10 @@ def test_update_id_stored_immediately():
             with patch('bot.TELEGRAM_TOKEN', 'test_token'):
                 with patch('bot.TELEGRAM_CHAT_ID', '123456789'):
                     # Patch requests.get to return our mock response
-                    with patch('requests.get') as mock_get:
+                    with patch('bot._SESSION.get') as mock_get:
                         mock_get.return_value = Mock(
                             status_code=200,
+                            content=json.dumps(mock_response).encode(),
                             json=lambda: mock_response
                         )
                         mock_get.return_value.raise_for_status = Mock()
@@ -102,9 +103,10 @@ def test_update_id_for_non_text_messages():
         with patch('bot.STATE_PATH', state_path):
             with patch('bot.TELEGRAM_TOKEN', 'test_token'):
                 with patch('bot.TELEGRAM_CHAT_ID', '123456789'):
-                    with patch('requests.get') as mock_get:
+                    with patch('bot._SESSION.get') as mock_get:
                         mock_get.return_value = Mock(
                             status_code=200,
+                            content=json.dumps(mock_response).encode(),
                             json=lambda: mock_response
                         )
                         mock_get.return_value.raise_for_status = Mock()
@@ -120,27 +122,3 @@ def test_update_id_for_non_text_messages():
                             "last_update_id should be updated even for non-text messages"
                         
                         print("✓ Update ID is stored for non-text messages too!")
-
-def run_tests():
-    """Run all tests"""
-    print("Running update_id fix tests...\n")
-    
-    try:
-        test_update_id_stored_immediately()
-        test_update_id_for_non_text_messages()
-        
-        print("\n✅ All update_id fix tests passed!")
-        return 0
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-    except Exception as e:
-        print(f"\n❌ Error running tests: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-
-if __name__ == "__main__":
-    exit(run_tests())